@@ -1,17 +1,35 @@
+import csv
+import heapq
 import json
+import operator
 import os
+import random
 import sys
+import threading
 import time
 import typing
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum
-from typing import Any, Callable, Iterable, List, Optional
+from typing import Any, Callable, Iterable, List, Mapping, Optional, TextIO
 
 import click
 import requests
+from requests.adapters import HTTPAdapter
 
 from . import cache
 from .product import Category, Product
 
+# orjson parses search responses several times faster than the stdlib; use it
+# when the fast-json extra is installed. Its JSONDecodeError subclasses the
+# stdlib one, so error handling is the same either way.
+try:
+    import orjson
+
+    json_loads: Callable[[bytes], Any] = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
 
 class SortBy(Enum):
     RELEVANCE = "relevance"
@@ -36,6 +54,91 @@ class EnvatoSite(Enum):
     THREE_D_OCEAN = "3docean"
 
 
+# Choice values for the --site and --sort-by options, built once for all commands
+_ENVATO_SITE_CHOICES = tuple(site.value for site in EnvatoSite)
+_SORT_BY_CHOICES = tuple(sort.value for sort in SortBy)
+
+
+# Shared across crawl worker threads so connections to the API are reused
+# instead of paying a TCP and TLS handshake per request.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+_SESSION.headers.update({"User-Agent": "envato-scrape/0.1.0"})
+
+# (connect, read) timeouts in seconds, so a stalled connection fails the call
+# instead of hanging a crawl worker forever.
+API_TIMEOUT = (5, 30)
+
+# Backoff for 429 responses without a usable Retry-After header: the delay
+# doubles from BACKOFF_BASE up to BACKOFF_CAP seconds, stretched by up to
+# BACKOFF_JITTER so concurrent clients don't retry in lockstep.
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 30.0
+BACKOFF_JITTER = 0.5
+RATE_LIMIT_MAX_RETRIES = 6
+
+# Start spacing out requests once the API reports fewer calls than this left
+# in the current rate-limit window.
+RATE_LIMIT_LOW_WATER = 3
+
+
+class RateLimiter:
+    """Spreads API calls over the rest of the rate-limit window once the
+    X-RateLimit-* response headers say the quota is nearly used up, rather
+    than waiting to be sent a 429. Shared by all crawl worker threads."""
+
+    interval: float
+    next_allowed: float
+    # time.monotonic() at which the API said the current window resets
+    reset_at: float
+    lock: threading.Lock
+
+    def __init__(self) -> None:
+        self.interval = 0.0
+        self.next_allowed = 0.0
+        self.reset_at = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until this thread may send its next request"""
+        with self.lock:
+            now = time.monotonic()
+            if now >= self.reset_at:
+                # The window has rolled over, so the quota is back
+                self.interval = 0.0
+            start = max(now, self.next_allowed)
+            # The quota refills at the reset, so no slot is reserved past it
+            self.next_allowed = max(start, min(start + self.interval, self.reset_at))
+        if start > now:
+            time.sleep(start - now)
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Adjust the spacing between requests from a response's headers"""
+        try:
+            remaining = int(headers["X-RateLimit-Remaining"])
+            reset = float(headers["X-RateLimit-Reset"])
+        except (KeyError, ValueError):
+            return
+        # Reset is sent either as a Unix timestamp or as seconds to go
+        window = max(reset - time.time() if reset > 1_000_000_000 else reset, 0.0)
+        with self.lock:
+            now = time.monotonic()
+            self.reset_at = now + window
+            if remaining >= RATE_LIMIT_LOW_WATER:
+                self.interval = 0.0
+                # Release slots reserved while the quota was low
+                self.next_allowed = min(self.next_allowed, now)
+            elif remaining == 0:
+                self.interval = window
+                self.next_allowed = self.reset_at
+            else:
+                self.interval = window / remaining
+                self.next_allowed = min(self.next_allowed, self.reset_at)
+
+
+_RATE_LIMITER = RateLimiter()
+
+
 def check_api_key() -> str:
     """Check if the Envato API key is present in environment variables"""
     api_key = os.environ.get("ENVATO_MARKET_API_KEY")
@@ -50,53 +153,57 @@ def check_api_key() -> str:
     return api_key
 
 
+def wait_for_rate_limit(retry_after: Optional[str], attempt: int) -> None:
+    """Sleep before retrying a rate-limited request, honouring Retry-After when
+    it is usable and backing off exponentially with jitter otherwise"""
+    if attempt >= RATE_LIMIT_MAX_RETRIES:
+        click.echo(f"Still rate limited after {attempt} retries. Giving up.", err=True)
+        sys.exit(1)
+
+    if retry_after:
+        try:
+            wait_time: float = int(retry_after)
+            click.echo(f"Rate limited. Retrying after {wait_time} seconds...", err=True)
+            time.sleep(wait_time)
+            return
+        except ValueError:
+            reason = "Invalid Retry-After header received."
+    else:
+        reason = "Rate limited but no Retry-After header."
+
+    wait_time = min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt) * (
+        1 + random.random() * BACKOFF_JITTER
+    )
+    click.echo(f"{reason} Waiting {wait_time:.1f} seconds...", err=True)
+    time.sleep(wait_time)
+
+
 def make_envato_api_call(
     api_key: str, endpoint: str, params: Optional[dict] = None
 ) -> typing.Any:
     """Make an API call to the Envato API with 429 retry handling"""
     base_url = "https://api.envato.com/v1/"
     url = base_url + endpoint
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "User-Agent": "envato-scrape/0.1.0",
-    }
+    headers = {"Authorization": f"Bearer {api_key}"}
 
+    attempt = 0
     while True:
         try:
-            response = requests.get(url, headers=headers, params=params)
+            _RATE_LIMITER.wait()
+            response = _SESSION.get(
+                url, headers=headers, params=params, timeout=API_TIMEOUT
+            )
+            _RATE_LIMITER.update(response.headers)
 
             # Handle 429 status code
             if response.status_code == 429:
-                retry_after = response.headers.get("Retry-After")
-                if retry_after:
-                    try:
-                        wait_time = int(retry_after)
-                        click.echo(
-                            f"Rate limited. Retrying after {wait_time} seconds...",
-                            err=True,
-                        )
-                        time.sleep(wait_time)
-                        continue  # Retry the request
-                    except ValueError:
-                        click.echo(
-                            "Invalid Retry-After header received. "
-                            + "Waiting 60 seconds...",
-                            err=True,
-                        )
-                        time.sleep(60)
-                        continue
-                else:
-                    click.echo(
-                        "Rate limited but no Retry-After header. "
-                        + "Waiting 60 seconds...",
-                        err=True,
-                    )
-                    time.sleep(60)
-                    continue
+                wait_for_rate_limit(response.headers.get("Retry-After"), attempt)
+                attempt += 1
+                continue  # Retry the request
 
             # For other status codes, raise an exception
             response.raise_for_status()
-            return response.json()
+            return json_loads(response.content)
         except requests.exceptions.RequestException as e:
             # If it's not a 429 error, exit
             if (
@@ -105,10 +212,8 @@ def make_envato_api_call(
                 and e.response.status_code == 429
             ):
                 # This shouldn't happen as we handle 429 above, but just in case
-                click.echo(
-                    "Rate limited (from exception). Waiting 60 seconds...", err=True
-                )
-                time.sleep(60)
+                wait_for_rate_limit(e.response.headers.get("Retry-After"), attempt)
+                attempt += 1
                 continue
             click.echo(f"API request failed: {e}", err=True)
             sys.exit(1)
@@ -135,7 +240,7 @@ def search_products(
     sort_by: Optional[str] = None,
     sort_direction: Optional[str] = None,
 ) -> List[Product]:
-    """Search for products on Envato"""
+    """Search for products on Envato. Products are not added to the cache."""
     endpoint = "discovery/search/search/item"
     params = {"site": f"{site}.net", "page": page}
 
@@ -153,10 +258,7 @@ def search_products(
     products = []
     if "matches" in data:
         for product_data in data["matches"]:
-            product = Product.from_dict(product_data)
-            products.append(product)
-            # Add to cache
-            cache.add_product(product)
+            products.append(Product.from_dict(product_data))
 
     return products
 
@@ -170,7 +272,7 @@ def categories() -> None:
 @categories.command("list")
 @click.option(
     "--site",
-    type=click.Choice([site.value for site in EnvatoSite], case_sensitive=False),
+    type=click.Choice(_ENVATO_SITE_CHOICES, case_sensitive=False),
     required=True,
     help="Envato site to list categories from",
 )
@@ -230,71 +332,57 @@ class ProductGroupStats:
         return self.total_revenue_per_day / self.product_count
 
     def add_product(self, product: Product) -> None:
+        sales = product.number_of_sales
+        revenue = (product.price_cents / 100.0) * sales
         self.product_count += 1
-        self.total_sales += product.number_of_sales
-        self.total_revenue += (product.price_cents / 100.0) * product.number_of_sales
-        self.min_sales = (
-            min(self.min_sales, product.number_of_sales)
-            if self.product_count > 1
-            else product.number_of_sales
-        )
-        self.min_revenue = (
-            min(
-                self.min_revenue,
-                (product.price_cents / 100.0) * product.number_of_sales,
-            )
-            if self.product_count > 1
-            else (product.price_cents / 100.0) * product.number_of_sales
-        )
-        self.max_sales = max(self.max_sales, product.number_of_sales)
-        self.max_revenue = max(
-            self.max_revenue, (product.price_cents / 100.0) * product.number_of_sales
-        )
+        self.total_sales += sales
+        self.total_revenue += revenue
+        if self.product_count > 1:
+            self.min_sales = min(self.min_sales, sales)
+            self.min_revenue = min(self.min_revenue, revenue)
+        else:
+            self.min_sales = sales
+            self.min_revenue = revenue
+        self.max_sales = max(self.max_sales, sales)
+        self.max_revenue = max(self.max_revenue, revenue)
         self.total_revenue_per_day += product.get_revenue_per_day()
 
 
-def product_group_stats_group_by(
-    group_key: Callable[[Product], str], products: Iterable[Product]
-) -> dict[str, ProductGroupStats]:
-    stats: dict[str, ProductGroupStats] = {}
-    for product in products:
-        key = group_key(product)
-        if key not in stats:
-            stats[key] = ProductGroupStats()
-        stats[key].add_product(product)
-    return stats
-
-
 def product_group_stats_group_by_all_with_dupe(
     group_key: Callable[[Product], List[str]], products: Iterable[Product]
 ) -> dict[str, ProductGroupStats]:
-    stats: dict[str, ProductGroupStats] = {}
+    stats: defaultdict[str, ProductGroupStats] = defaultdict(ProductGroupStats)
     for product in products:
         for key in group_key(product):
-            if key not in stats:
-                stats[key] = ProductGroupStats()
             stats[key].add_product(product)
-    return stats
+    return dict(stats)
+
 
+def write_csv(
+    data: Iterable[Any],
+    row_callback: Callable[[Any], dict[str, Any]],
+    *,
+    sort_by: str,
+    out: Optional[TextIO] = None,
+) -> None:
+    """Write a list of data as CSV using a row callback to extract fields.
 
-def make_csv(
-    data: Iterable[Any], row_callback: Callable[[Any], dict[str, Any]], *, sort_by: str
-) -> str:
-    """Convert a list of data to CSV format using a row callback to extract fields"""
+    Rows are sorted by the `sort_by` field in descending order and written to
+    `out`, which defaults to standard output.
+    """
     rows: List[dict[str, Any]] = [row_callback(item) for item in data]
     if not rows:
-        return ""
+        return
     # Sort rows by the specified field in descending order
-    rows.sort(key=lambda x: x.get(sort_by, 0), reverse=True)
+    rows.sort(key=operator.itemgetter(sort_by), reverse=True)
+    if out is None:
+        out = sys.stdout
     # Create CSV header
-    headers = rows[0].keys()
-    csv_lines = [",".join(headers)]
-    # Create CSV rows
-    for row in rows:
-        csv_lines.append(
-            ",".join(('"' + str(row[h]).replace('"', '""') + '"') for h in headers)
-        )
-    return "\n".join(csv_lines)
+    headers = list(rows[0].keys())
+    csv.writer(out, lineterminator="\n").writerow(headers)
+    # Stream CSV rows, every field quoted
+    writer = csv.writer(out, quoting=csv.QUOTE_ALL, lineterminator="\n")
+    writer.writerows([row[h] for h in headers] for row in rows)
 
 
 def get_compatible_with(product: Product) -> List[str]:
@@ -310,7 +398,7 @@ def get_compatible_software(product: Product) -> List[str]:
 @inspect.command("by-compatible-plugins")
 @click.option(
     "--site",
-    type=click.Choice([site.value for site in EnvatoSite], case_sensitive=False),
+    type=click.Choice(_ENVATO_SITE_CHOICES, case_sensitive=False),
     required=True,
     help="Envato site to analyze",
 )
@@ -322,16 +410,18 @@ def get_compatible_software(product: Product) -> List[str]:
 )
 def _inspect_by_compatible_plugins(site: str, published_after: Optional[str]) -> None:
     """Show sales statistics per compatible plugins"""
+    site_domain = sys.intern(f"{site}.net")
     # Group products by category
     category_stats = product_group_stats_group_by_all_with_dupe(
         get_compatible_with,
-        filter(
-            lambda x: x.site == f"{site}.net"
-            and (not published_after or x.published_at > published_after),
-            cache.get_products().values(),
+        (
+            product
+            for product in cache.get_products().values()
+            if product.site == site_domain
+            and (not published_after or product.published_at > published_after)
         ),
     )
-    csv: str = make_csv(
+    write_csv(
         category_stats.items(),
         lambda item: (
             {
@@ -355,7 +445,6 @@ def _inspect_by_compatible_plugins(site: str, published_after: Optional[str]) ->
         ),
         sort_by="average_revenue",
     )
-    click.echo(csv)
 
 
 @inspect.command("wordpress-business-recent")
@@ -391,7 +480,7 @@ def _inspect_wordpress_business_recent(published_after: Optional[str]) -> None:
 @inspect.command("by-compatible-software")
 @click.option(
     "--site",
-    type=click.Choice([site.value for site in EnvatoSite], case_sensitive=False),
+    type=click.Choice(_ENVATO_SITE_CHOICES, case_sensitive=False),
     required=True,
     help="Envato site to analyze",
 )
@@ -403,16 +492,18 @@ def _inspect_wordpress_business_recent(published_after: Optional[str]) -> None:
 )
 def _inspect_by_compatible_software(site: str, published_after: Optional[str]) -> None:
     """Show sales statistics per compatible software (e.g. wordpress version)"""
+    site_domain = sys.intern(f"{site}.net")
     # Group products by category
     category_stats = product_group_stats_group_by_all_with_dupe(
         get_compatible_software,
-        filter(
-            lambda x: x.site == f"{site}.net"
-            and (not published_after or x.published_at > published_after),
-            cache.get_products().values(),
+        (
+            product
+            for product in cache.get_products().values()
+            if product.site == site_domain
+            and (not published_after or product.published_at > published_after)
         ),
     )
-    csv: str = make_csv(
+    write_csv(
         category_stats.items(),
         lambda item: (
             {
@@ -436,7 +527,6 @@ def _inspect_by_compatible_software(site: str, published_after: Optional[str]) -
         ),
         sort_by="average_revenue",
     )
-    click.echo(csv)
 
 
 @inspect.command("elementor-core-only")
@@ -470,52 +560,56 @@ def _inspect_elementor_core_only(published_after: Optional[str]) -> None:
 )
 @click.option(
     "--site",
-    type=click.Choice([site.value for site in EnvatoSite], case_sensitive=False),
+    type=click.Choice(_ENVATO_SITE_CHOICES, case_sensitive=False),
     required=True,
     help="Envato site to analyze",
 )
 def _inspect_by_category(site: str, published_after: Optional[str]) -> None:
     """Show sales statistics per category"""
-    # Group products by category
-    category_stats = product_group_stats_group_by(
-        lambda p: p.classification,
-        filter(lambda x: x.site == f"{site}.net" and (not published_after or x.published_at > published_after), cache.get_products().values()),
-    )
-    csv: str = make_csv(
-        category_stats.items(),
-        lambda item: (
-            {
-                "category": item[0],
-                "product_count": item[1].product_count,
-                "total_sales": item[1].total_sales,
-                "average_sales": (
-                    item[1].total_sales / item[1].product_count
-                    if item[1].product_count > 0
-                    else 0
-                ),
-                "average_revenue": (
-                    item[1].total_revenue / item[1].product_count
-                    if item[1].product_count > 0
-                    else 0
-                ),
-                "total_products": cache.get_categories()[site][item[0]].total_products
-                or 0,
-                "average_revenue_per_day": item[1].get_average_revenue_per_day(),
-                "sales_products_ratio": (
-                    item[1].total_sales
-                    / (cache.get_categories()[site][item[0]].total_products or 1)
-                ),
-            }
-        ),
-        sort_by="average_revenue",
-    )
-    click.echo(csv)
+    # The cache already groups products by site and category
+    category_stats: dict[str, ProductGroupStats] = {}
+    for category, products in cache.get_products_by_site_category(
+        f"{site}.net"
+    ).items():
+        stats = ProductGroupStats()
+        for product in products:
+            if not published_after or product.published_at > published_after:
+                stats.add_product(product)
+        if stats.product_count > 0:
+            category_stats[category] = stats
+    site_categories = cache.get_categories().get(site, {})
+
+    def category_row(item: typing.Tuple[str, ProductGroupStats]) -> dict[str, Any]:
+        category, stats = item
+        # Products can be cached for categories that were never listed
+        category_obj = site_categories.get(category)
+        total_products = (category_obj.total_products if category_obj else None) or 0
+        return {
+            "category": category,
+            "product_count": stats.product_count,
+            "total_sales": stats.total_sales,
+            "average_sales": (
+                stats.total_sales / stats.product_count
+                if stats.product_count > 0
+                else 0
+            ),
+            "average_revenue": (
+                stats.total_revenue / stats.product_count
+                if stats.product_count > 0
+                else 0
+            ),
+            "total_products": total_products,
+            "average_revenue_per_day": stats.get_average_revenue_per_day(),
+            "sales_products_ratio": stats.total_sales / (total_products or 1),
+        }
+
+    write_csv(category_stats.items(), category_row, sort_by="average_revenue")
 
 
 @inspect.command("category-head")
 @click.option(
     "--site",
-    type=click.Choice([site.value for site in EnvatoSite], case_sensitive=False),
+    type=click.Choice(_ENVATO_SITE_CHOICES, case_sensitive=False),
     required=True,
     help="Envato site to analyze",
 )
@@ -533,51 +627,43 @@ def _inspect_by_category(site: str, published_after: Optional[str]) -> None:
 )
 def _inspect_category_head(site: str, category: str, number: int) -> None:
     """Show top products in a category sorted by sales"""
-    # Filter products by site and category
-    filtered_products = []
-    for product in cache.get_products().values():
-        if product.site == f"{site}.net" and product.classification == category:
-            filtered_products.append(product)
-
-    # Sort by number of sales in descending order
-    filtered_products.sort(key=lambda x: x.number_of_sales, reverse=True)
-
-    # Take the top n products
-    top_products = filtered_products[:number]
+    filtered_products = cache.get_products_in_category(f"{site}.net", category)
 
-    # Output as CSV with headers
-    click.echo("URL,Title,Sales,Price,Total Revenue,Author Username")
-    for product in top_products:
-        # Calculate total revenue
-        price_dollars = product.price_cents / 100
-        total_revenue = product.number_of_sales * price_dollars
-
-        # Escape quotes in fields that may contain commas
-        title = product.name.replace('"', '""')
-        url = product.url.replace('"', '""')
-        author_username = product.author_username.replace('"', '""')
+    # Take the top n products by number of sales, in descending order
+    top_products = heapq.nlargest(
+        number, filtered_products, key=operator.attrgetter("number_of_sales")
+    )
 
-        click.echo(
-            f'"{url}",'
-            f'"{title}",'
-            f"{product.number_of_sales},"
-            f"{price_dollars:.2f},"
-            f"{total_revenue:.2f},"
-            f'"{author_username}"'
+    # Output as CSV with headers, quoting every field like write_csv
+    csv.writer(sys.stdout, lineterminator="\n").writerow(
+        ["URL", "Title", "Sales", "Price", "Total Revenue", "Author Username"]
+    )
+    writer = csv.writer(sys.stdout, quoting=csv.QUOTE_ALL, lineterminator="\n")
+    writer.writerows(
+        (
+            product.url,
+            product.name,
+            product.number_of_sales,
+            f"{product.price_cents / 100:.2f}",
+            f"{product.number_of_sales * (product.price_cents / 100):.2f}",
+            product.author_username,
         )
+        for product in top_products
+    )
 
 
 @fetch.command("category-products")
 @click.option(
     "--site",
-    type=click.Choice([site.value for site in EnvatoSite], case_sensitive=False),
+    type=click.Choice(_ENVATO_SITE_CHOICES, case_sensitive=False),
     required=True,
     help="Envato site to fetch category products for",
 )
 def fetch_category_sales(site: str) -> None:
     """Fetch total products for each category in the cache"""
+    site_categories = cache.get_categories().get(site, {})
     # Check if categories exist in cache
-    if site not in cache.get_categories() or not cache.get_categories()[site]:
+    if not site_categories:
         click.echo(f"Error: No categories found in cache for site '{site}'", err=True)
         click.echo(
             "Please run 'envato-scrape categories list --site <site>' first "
@@ -588,14 +674,16 @@ def fetch_category_sales(site: str) -> None:
 
     api_key = check_api_key()
 
+    # Make API calls to the search endpoint to get total_hits
+    endpoint = "discovery/search/search/item"
+    site_domain = f"{site}.net"
+
     # Process each category
-    for category in cache.get_categories()[site].values():
+    for category in site_categories.values():
         click.echo(f"Fetching products for category: {category.path}")
 
-        # Make API call to search endpoint to get total_hits
-        endpoint = "discovery/search/search/item"
         params = {
-            "site": f"{site}.net",
+            "site": site_domain,
             "category": category.path,
             "page": 1,
         }
@@ -607,15 +695,73 @@ def fetch_category_sales(site: str) -> None:
         if total_products is not None:
             # Update the category's total_products field
             category.total_products = total_products
+            cache.mark_categories_dirty()
             click.echo(f"  Total products: {total_products}")
         else:
             click.echo("  Could not find total products information", err=True)
 
 
+def crawl_category(
+    executor: ThreadPoolExecutor,
+    workers: int,
+    api_key: str,
+    site: str,
+    category_path: str,
+    pages: List[int],
+    term: Optional[str],
+    sort_by: Optional[str],
+    sort_direction: Optional[str],
+) -> int:
+    """Fetch pages of a category with up to `workers` requests in flight, adding
+    products to the cache until a page comes back empty"""
+    remaining_pages = iter(pages)
+    in_flight: typing.Deque[typing.Tuple[int, Future[List[Product]]]] = deque()
+
+    def submit_next_page() -> None:
+        page = next(remaining_pages, None)
+        if page is not None:
+            future = executor.submit(
+                search_products,
+                api_key,
+                site,
+                category_path,
+                term,
+                page,
+                sort_by,
+                sort_direction,
+            )
+            in_flight.append((page, future))
+
+    for _ in range(workers):
+        submit_next_page()
+
+    # Results are consumed in page order so the cache is only touched from the
+    # calling thread.
+    added = 0
+    while in_flight:
+        page, future = in_flight.popleft()
+        click.echo(f"  Scraping page {page}...")
+        products = future.result()
+        for product in products:
+            cache.add_product(product)
+        added += len(products)
+
+        if not products:
+            click.echo(
+                f"  No more products found on page {page}, moving to next category."
+            )
+            for _, pending in in_flight:
+                pending.cancel()
+            break
+        submit_next_page()
+
+    return added
+
+
 @fetch.command("search-crawl")
 @click.option(
     "--site",
-    type=click.Choice([site.value for site in EnvatoSite], case_sensitive=False),
+    type=click.Choice(_ENVATO_SITE_CHOICES, case_sensitive=False),
     required=True,
     help="Envato site to search on",
 )
@@ -643,7 +789,7 @@ def fetch_category_sales(site: str) -> None:
 )
 @click.option(
     "--sort-by",
-    type=click.Choice([sort.value for sort in SortBy], case_sensitive=False),
+    type=click.Choice(_SORT_BY_CHOICES, case_sensitive=False),
     help="Sort results by the specified field",
 )
 @click.option(
@@ -652,6 +798,12 @@ def fetch_category_sales(site: str) -> None:
     default="desc",
     help="Sort direction (asc or desc)",
 )
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1, max=16),
+    default=8,
+    help="Number of pages to fetch concurrently",
+)
 def _crawl(
     site: str,
     category: Optional[str],
@@ -661,9 +813,11 @@ def _crawl(
     all_pages: bool,
     sort_by: Optional[str],
     sort_direction: str,
+    workers: int,
 ) -> None:
     """Crawl pages from search and add products to cache"""
     click.echo(f"Crawling products on site: {site}")
+    site_categories = cache.get_categories().get(site, {})
     if all_categories:
         if category is not None:
             click.echo(
@@ -672,7 +826,7 @@ def _crawl(
             sys.exit(1)
 
         # Get categories from cache
-        if site not in cache.get_categories():
+        if not site_categories:
             click.echo(
                 f"Error: No categories found in cache for site '{site}'", err=True
             )
@@ -698,22 +852,20 @@ def _crawl(
     categories_to_crawl: List[Category] = []
 
     if all_categories:
-        # Print category paths
-        print(list(cache.get_categories()[site].values()))
-        categories_to_crawl = list(cache.get_categories()[site].values())
-        category_paths = [cat.path for cat in cache.get_categories()[site].values()]
+        categories_to_crawl = list(site_categories.values())
+        category_paths = [cat.path for cat in categories_to_crawl]
         click.echo(f"Found categories: {', '.join(category_paths)}")
     else:
-        category_obj_list = [
-            cat for cat in cache.get_categories()[site].values() if cat.path == category
-        ]
-        if len(category_obj_list) == 0:
+        # Categories are cached by path
+        assert category is not None
+        category_obj = site_categories.get(category)
+        if category_obj is None:
             click.echo(
                 f"Error: Category '{category}' not found in cache for site '{site}'",
                 err=True,
             )
             sys.exit(1)
-        categories_to_crawl = [category_obj_list[0]]
+        categories_to_crawl = [category_obj]
 
     pages_to_crawl: List[int] = []
     if all_pages:
@@ -732,20 +884,20 @@ def _crawl(
     )
 
     # Crawl each category
-    for category_obj in categories_to_crawl:
-        click.echo(f"Crawling category: {category_obj.path}")
-        for page in pages_to_crawl:
-            click.echo(f"  Scraping page {page}...")
-            products = search_products(
-                api_key, site, category_obj.path, term, page, sort_by, sort_direction
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for category_obj in categories_to_crawl:
+            click.echo(f"Crawling category: {category_obj.path}")
+            total_products += crawl_category(
+                executor,
+                workers,
+                api_key,
+                site,
+                category_obj.path,
+                pages_to_crawl,
+                term,
+                sort_by,
+                sort_direction,
             )
-            total_products += len(products)
-
-            if not products:
-                click.echo(
-                    f"  No more products found on page {page}, moving to next category."
-                )
-                break
 
     click.echo(f"Added {total_products} products to cache")
 
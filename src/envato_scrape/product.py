@@ -1,9 +1,11 @@
+import sys
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
+from datetime import datetime
 from typing import Any, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Rating:
     rating: float
     count: int
@@ -16,7 +18,7 @@ class Rating:
         return cls(rating=data.get("rating", 0.0), count=data.get("count", 0))
 
 
-@dataclass
+@dataclass(slots=True)
 class Length:
     hours: int
     minutes: int
@@ -34,7 +36,7 @@ class Length:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Preview:
     icon_url: str
     mp3_url: str
@@ -65,7 +67,7 @@ class Preview:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Product:
     id: int
     name: str
@@ -92,11 +94,29 @@ class Product:
     image_urls: list[str]
     tags: list[str]
     discounts: list[dict]
+    # name -> value view of attributes, built on the first get_attribute call.
+    # Derived data, so __getstate__ leaves it out of the cache.
+    _attr_index: Optional[dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in _PRODUCT_STATE_FIELDS}
+
+    def __setstate__(self, state: Any) -> None:
+        # Caches written before __getstate__ existed hold the default
+        # (None, slots) state, which may include an attribute index.
+        if isinstance(state, tuple):
+            state = state[1]
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._attr_index = None
 
     def get_revenue_per_day(self) -> float:
+        # fromisoformat is far cheaper than strptime, which matters when this
+        # runs for every product in an inspect command.
         days_published = (
-            time.time()
-            - time.mktime(time.strptime(self.published_at, "%Y-%m-%dT%H:%M:%S+00:00"))
+            time.time() - datetime.fromisoformat(self.published_at).timestamp()
         ) / 86400
         revenue_per_day = (
             ((self.price_cents / 100.0) * self.number_of_sales / days_published)
@@ -106,10 +126,14 @@ class Product:
         return revenue_per_day
 
     def get_attribute(self, name: str) -> Optional[Any]:
-        for attrib in self.attributes:
-            if attrib["name"] == name:
-                return attrib["value"]
-        return None
+        index = self._attr_index
+        if index is None:
+            # First match wins, as with a linear scan
+            index = {}
+            for attrib in self.attributes:
+                index.setdefault(attrib["name"], attrib["value"])
+            self._attr_index = index
+        return index.get(name)
 
     def serialize(self) -> dict:
         return {
@@ -142,42 +166,67 @@ class Product:
 
     @classmethod
     def from_dict(cls, data: dict) -> "Product":
+        # Called once per search match and per cached product, so bind
+        # data.get locally and build the nested dataclasses inline instead of
+        # going through their from_dict classmethods.
+        g = data.get
+        # These repeat across most products; interning shares one str object
+        # per distinct value and lets equality checks succeed on identity.
+        intern = sys.intern
+        rating = g("rating") or {}
+        preview = (g("previews") or {}).get("icon_with_audio_preview") or {}
+        length = preview.get("length") or {}
         return cls(
-            id=data.get("id", 0),
-            name=data.get("name", ""),
-            description=data.get("description", ""),
-            description_html=data.get("description_html", ""),
-            site=data.get("site", ""),
-            classification=data.get("classification", ""),
-            classification_url=data.get("classification_url", ""),
-            price_cents=data.get("price_cents", 0),
-            number_of_sales=data.get("number_of_sales", 0),
-            author_username=data.get("author_username", ""),
-            author_url=data.get("author_url", ""),
-            author_image=data.get("author_image", ""),
-            url=data.get("url", ""),
-            summary=data.get("summary", ""),
-            rating=Rating.from_dict(data.get("rating", {})),
-            updated_at=data.get("updated_at", ""),
-            published_at=data.get("published_at", ""),
-            trending=data.get("trending", False),
-            previews=Preview.from_dict(
-                data.get("previews", {}).get("icon_with_audio_preview", {})
+            g("id", 0),
+            g("name", ""),
+            g("description", ""),
+            g("description_html", ""),
+            intern(g("site") or ""),
+            intern(g("classification") or ""),
+            intern(g("classification_url") or ""),
+            g("price_cents", 0),
+            g("number_of_sales", 0),
+            intern(g("author_username") or ""),
+            g("author_url", ""),
+            g("author_image", ""),
+            g("url", ""),
+            g("summary", ""),
+            Rating(rating.get("rating", 0.0), rating.get("count", 0)),
+            g("updated_at", ""),
+            g("published_at", ""),
+            g("trending", False),
+            Preview(
+                preview.get("icon_url", ""),
+                preview.get("mp3_url", ""),
+                preview.get("mp3_preview_waveform_url", ""),
+                preview.get("mp3_preview_download_url", ""),
+                preview.get("mp3_id", 0),
+                Length(
+                    length.get("hours", 0),
+                    length.get("minutes", 0),
+                    length.get("seconds", 0),
+                ),
             ),
-            attributes=data.get("attributes", []),
-            photo_attributes=data.get("photo_attributes", []),
-            key_features=data.get("key_features", []),
-            image_urls=data.get("image_urls", []),
-            tags=data.get("tags", []),
-            discounts=data.get("discounts", []),
+            g("attributes", []),
+            g("photo_attributes", []),
+            g("key_features", []),
+            g("image_urls", []),
+            g("tags", []),
+            g("discounts", []),
         )
 
 
+# Fields pickled for a Product
+_PRODUCT_STATE_FIELDS = tuple(
+    f.name for f in fields(Product) if f.name != "_attr_index"
+)
+
+
+@dataclass(slots=True)
 class Category:
-    def __init__(self, name: str, path: str, total_products: Optional[int] = None):
-        self.name = name
-        self.path = path
-        self.total_products = total_products
+    name: str
+    path: str
+    total_products: Optional[int] = None
 
     def serialize(self) -> dict:
         result: dict[str, Any] = {"name": self.name, "path": self.path}